@@ -0,0 +1,208 @@
+#
+# Directory listing for the syncdbapp.py source tree scans.
+# On MacOS the directory entries and their attributes (type, modification/change times, size) are read
+# with the getattrlistbulk(2) system call, which returns many entries in a single call, via ctypes.
+# On other OSs (or if the call is not available) the standard os.scandir() is used.
+#
+# Version: 1.0
+# Author: Istvan Z. Kovacs, 2026
+#
+#    Copyright 2026, Istvan Z. Kovacs.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+#
+import ctypes
+import ctypes.util
+import logging
+import os
+import struct
+import sys
+from typing import Iterator, NamedTuple
+from collections.abc import Callable
+
+# Constants (see <sys/attr.h> and <sys/vnode.h>)
+ATTR_BIT_MAP_COUNT      = 5
+ATTR_CMN_NAME           = 0x00000001
+ATTR_CMN_OBJTYPE        = 0x00000008
+ATTR_CMN_MODTIME        = 0x00000400
+ATTR_CMN_CHGTIME        = 0x00000800
+ATTR_CMN_ERROR          = 0x20000000
+ATTR_CMN_RETURNED_ATTRS = 0x80000000
+ATTR_FILE_DATALENGTH    = 0x00000200
+VREG = 1
+VDIR = 2
+BULK_BUFFER_SIZE = 64 * 1024
+
+
+class _AttrList(ctypes.Structure):
+    """The struct attrlist argument of getattrlistbulk()."""
+    _fields_ = [
+        ("bitmapcount", ctypes.c_ushort),
+        ("reserved", ctypes.c_uint16),
+        ("commonattr", ctypes.c_uint32),
+        ("volattr", ctypes.c_uint32),
+        ("dirattr", ctypes.c_uint32),
+        ("fileattr", ctypes.c_uint32),
+        ("forkattr", ctypes.c_uint32),
+    ]
+
+
+def _load_getattrlistbulk() -> Callable | None:
+    """Get the getattrlistbulk() function from libc, or None when not available."""
+    if sys.platform != 'darwin':
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True)
+        func = libc.getattrlistbulk
+    except (OSError, AttributeError):
+        return None
+    func.argtypes = [ctypes.c_int, ctypes.POINTER(_AttrList), ctypes.c_void_p, ctypes.c_size_t, ctypes.c_uint64]
+    func.restype  = ctypes.c_int
+    return func
+
+_getattrlistbulk = _load_getattrlistbulk()
+
+
+class BulkStat(NamedTuple):
+    """The subset of os.stat_result fields returned by getattrlistbulk()."""
+    st_size: int
+    st_mtime: float
+    st_ctime: float
+
+
+class BulkDirEntry:
+    """
+    The subset of os.DirEntry for an entry returned by getattrlistbulk().
+    The attributes are those of the entry itself, i.e. symbolic links are never followed.
+    """
+    __slots__ = ('name', 'path', '_objtype', '_stat')
+
+    def __init__(self, topdir: str, name: str, objtype: int, stat: BulkStat):
+        self.name = name
+        self.path = os.path.join(topdir, name)
+        self._objtype = objtype
+        self._stat = stat
+
+    def is_dir(self, *, follow_symlinks: bool = True) -> bool:
+        return self._objtype == VDIR
+
+    def is_file(self, *, follow_symlinks: bool = True) -> bool:
+        return self._objtype == VREG
+
+    def stat(self, *, follow_symlinks: bool = True) -> BulkStat:
+        return self._stat
+
+    def __repr__(self) -> str:
+        return f"<BulkDirEntry {self.name!r}>"
+
+
+def _read_bulk_entries(topdir: str) -> Iterator[BulkDirEntry]:
+    """Read all the entries of the topdir directory with getattrlistbulk()."""
+    attrlist = _AttrList(
+        bitmapcount=ATTR_BIT_MAP_COUNT,
+        commonattr=ATTR_CMN_RETURNED_ATTRS | ATTR_CMN_NAME | ATTR_CMN_ERROR | ATTR_CMN_OBJTYPE | ATTR_CMN_MODTIME | ATTR_CMN_CHGTIME,
+        fileattr=ATTR_FILE_DATALENGTH,
+    )
+    buffer = ctypes.create_string_buffer(BULK_BUFFER_SIZE)
+
+    fd = os.open(topdir, os.O_RDONLY | getattr(os, 'O_DIRECTORY', 0))
+    try:
+        while True:
+            count = _getattrlistbulk(fd, ctypes.byref(attrlist), buffer, BULK_BUFFER_SIZE, 0)
+            if count == 0:
+                return
+            if count < 0:
+                errno = ctypes.get_errno()
+                raise OSError(errno, os.strerror(errno), topdir)
+
+            # Each entry: length, returned attributes bitmaps, then the returned attributes in the bit order.
+            # The attributes are packed (4 bytes aligned), hence the '=' (no alignment) struct formats.
+            data = buffer.raw
+            entry_pos = 0
+            for _ in range(count):
+                (length,) = struct.unpack_from('=I', data, entry_pos)
+                common, _, _, fileattr, _ = struct.unpack_from('=5I', data, entry_pos + 4)
+                pos = entry_pos + 4 + 4 * ATTR_BIT_MAP_COUNT
+                entry_pos += length
+
+                error = 0
+                if common & ATTR_CMN_ERROR:
+                    (error,) = struct.unpack_from('=I', data, pos)
+                    pos += 4
+
+                # The name is an attrreference_t: offset (from the reference itself) and length (with the NUL)
+                name = ''
+                if common & ATTR_CMN_NAME:
+                    name_offset, name_length = struct.unpack_from('=iI', data, pos)
+                    name = os.fsdecode(data[pos + name_offset:pos + name_offset + name_length].split(b'\0', 1)[0])
+                    pos += 8
+
+                # The attributes of the entry could not be read: report and skip it
+                if error or not name:
+                    logging.warning("Skipping %s: %s", os.path.join(topdir, name) if name else f"an entry in {topdir}",
+                                    os.strerror(error) if error else "no name returned")
+                    continue
+
+                objtype = 0
+                if common & ATTR_CMN_OBJTYPE:
+                    (objtype,) = struct.unpack_from('=I', data, pos)
+                    pos += 4
+                mtime = ctime = 0.0
+                if common & ATTR_CMN_MODTIME:
+                    sec, nsec = struct.unpack_from('=qq', data, pos)
+                    mtime = sec + nsec * 1e-9
+                    pos += 16
+                if common & ATTR_CMN_CHGTIME:
+                    sec, nsec = struct.unpack_from('=qq', data, pos)
+                    ctime = sec + nsec * 1e-9
+                    pos += 16
+                size = 0
+                if fileattr & ATTR_FILE_DATALENGTH:
+                    (size,) = struct.unpack_from('=q', data, pos)
+
+                yield BulkDirEntry(topdir, name, objtype, BulkStat(size, mtime, ctime))
+    finally:
+        os.close(fd)
+
+
+class _BulkScandirIterator:
+    """Iterator over the BulkDirEntry entries of a directory, usable as a context manager (like os.scandir())."""
+
+    def __init__(self, topdir: str):
+        self._entries = _read_bulk_entries(topdir)
+
+    def __iter__(self):
+        return self
+
+    def __next__(self) -> BulkDirEntry:
+        return next(self._entries)
+
+    def close(self):
+        self._entries.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+def scandir(topdir: str):
+    """
+    Drop-in replacement of os.scandir() for the source tree scans.
+    On MacOS the entries are read with getattrlistbulk(), and their stat() needs no extra system call.
+    On other OSs os.scandir() is used.
+    """
+    if _getattrlistbulk is None:
+        return os.scandir(topdir)
+    return _BulkScandirIterator(topdir)
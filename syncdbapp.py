@@ -11,7 +11,8 @@
 # See https://github.com/istvanzk/cloudfile for more details.
 # Make sure to have it in the same directory as this script, or adjust the path in the code accordingly.
 # The evict process is started by the `cloudfile` but it runs in the background and managed by the app of the cloud provider (e.g., Dropbox, iCloud).
-# The code here introduces delays to ensure the files are ccopied and sync, and also implements a 2nd retry attempt for evictions that fail the first time.
+# The code here waits once after all the files are copied, to ensure the files are synced, and tries each eviction up to 3 times.
+# It also implements a 2nd retry attempt (up to 3 more tries) for the evictions that fail the first time.
 # Depending on the cloud provider and internet bandwidth, the eviction command and process may need to be further adjusted.
 # For other OSs than MacOS, the `cloudfile` application needs to be replaced with a similar application built for the corresponding OS.
 
@@ -32,6 +33,7 @@
 #    See the License for the specific language governing permissions and
 #    limitations under the License.
 #
+import atexit
 import random
 from click import Tuple
 import wx
@@ -42,22 +44,42 @@ import os
 import subprocess
 import shutil
 import logging
-from stat import S_ISDIR, S_ISREG
+import logging.handlers
+import queue
+import concurrent.futures
+import json
 from typing import Any, Dict, List
-from collections.abc import Callable
+import _bulk_scan
+
+# Use the faster libyaml based loader/dumper when available
+try:
+    from yaml import CSafeLoader as SafeLoader, CSafeDumper as SafeDumper
+except ImportError:
+    from yaml import SafeLoader, SafeDumper
 
 # Constants
 LOG_FILE_PATH  = "history_syncdbapp"
 TASKS_CONFIG_FILE = "config.yaml"
+EVICT_WORKERS  = 4      # Number of parallel evict commands
+UI_UPDATE_INTERVAL = 1/30  # Minimum time (seconds) between the progress updates sent to the UI thread
+EVICT_SETTLE_DELAY = 5.0  # Seconds to wait for the Cloud provider to "see" the copied files before evicting them
 
 # Setup Logging configuration
 # Log file name with timestamp to avoid overwriting
-logging.basicConfig(
-    filename=LOG_FILE_PATH + "_" + time.strftime("%Y%m%d_%H%M%S", time.localtime()) + ".log",
-    level=logging.DEBUG,
-    format='%(asctime)s - %(levelname)s - (%(threadName)-10s) - %(message)s',
+# The log records are queued and written to the file by a background thread,
+# such that the worker threads do not wait for the file writes
+log_file_handler = logging.FileHandler(LOG_FILE_PATH + "_" + time.strftime("%Y%m%d_%H%M%S", time.localtime()) + ".log")
+log_file_handler.setFormatter(logging.Formatter(
+    fmt='%(asctime)s - %(levelname)s - (%(threadName)-10s) - %(message)s',
     datefmt='%Y-%m-%d %H:%M:%S'
-)
+))
+log_queue: queue.Queue = queue.Queue(-1)
+log_listener = logging.handlers.QueueListener(log_queue, log_file_handler, respect_handler_level=True)
+logging.getLogger().setLevel(logging.DEBUG)
+logging.getLogger().addHandler(logging.handlers.QueueHandler(log_queue))
+log_listener.start()
+# Flush the queued records at process exit, after the worker threads have finished
+atexit.register(log_listener.stop)
         
 class SyncDBFrame(wx.Frame):
     """Main wxPython application window for syncing local files to Dropbox cloud."""
@@ -73,9 +95,10 @@ class SyncDBFrame(wx.Frame):
         self.taskGauges: list[wx.Gauge]  = []
         self.taskStatus: list[wx.StaticText]  = []
         self.taskFiles: list[list[tuple]] = []
+        self.taskIndex: list[dict[str, list | None]] = []
 
         # Initial states
-        self.stop_requested = False
+        self.stop_event = threading.Event()
         self.run_scan  = True
         self.run_copy  = True
         self.run_evict = False
@@ -83,6 +106,11 @@ class SyncDBFrame(wx.Frame):
         # Load task configurations from file
         self.load_tasks_from_config()
 
+        # Thread pool running the tasks (one worker thread per task)
+        # The pool threads are not daemon threads: on exit, the running file copies are finished (see on_close)
+        self.task_executor = concurrent.futures.ThreadPoolExecutor(max_workers=len(self.taskConfigs) or 4, thread_name_prefix='SyncTask')
+        self.task_futures: dict[int, concurrent.futures.Future] = {}
+
         # Main panel
         self.panel = wx.Panel(self)
         
@@ -181,12 +209,14 @@ class SyncDBFrame(wx.Frame):
         
         try:
             with open(config_path) as file:
-                config = yaml.safe_load(file)
+                config = yaml.load(file, Loader=SafeLoader)
                 self.taskConfigs = config.get('tasks', []) if config else []
                 if len(self.taskConfigs) == 0:
                     logging.warning("No tasks found in config file %s", config_path)
                 else:
-                    logging.info("Loaded %s tasks from config file %s", str(self.taskConfigs), config_path)
+                    logging.info("Loaded %d tasks from config file %s", len(self.taskConfigs), config_path)
+                    if logging.getLogger().isEnabledFor(logging.DEBUG):
+                        logging.debug("Tasks: %r", self.taskConfigs)
         except Exception as e:
             logging.error("Error reading tasks config file: %s", str(e))
             self.taskConfigs = []
@@ -201,12 +231,47 @@ class SyncDBFrame(wx.Frame):
         
         try:
             with open(config_path, 'w') as file:
-                yaml.safe_dump({'tasks': self.taskConfigs}, file, sort_keys=False)
-            logging.info("Saved %s tasks to config file %s", str(self.taskConfigs), config_path)
+                # The internal (underscore) task configs are not saved
+                tasks = [{key: value for key, value in task.items() if not key.startswith('_')} for task in self.taskConfigs]
+                yaml.dump({'tasks': tasks}, file, Dumper=SafeDumper, sort_keys=False)
+            logging.info("Saved %d tasks to config file %s", len(self.taskConfigs), config_path)
         except Exception as e:
             logging.error("Error writing Tasks config file: %s", str(e))
             raise e
 
+    def task_index_path(self, task_id: int) -> str:
+        """Path of the JSON file with the source files index of a task (next to the config file)."""
+        return os.path.join(os.path.dirname(__file__), f"{LOG_FILE_PATH}_{self.taskLabels[task_id-1]}.json")
+
+    def load_task_index(self, task_id: int) -> dict[str, list | None]:
+        """
+        Load the (filepath -> [modification_time, size]) index of the source files stored at the last sync of a task.
+        The files whose copy failed have a None entry.
+        """
+        index_path = self.task_index_path(task_id)
+        if not os.path.exists(index_path):
+            return {}
+
+        try:
+            with open(index_path) as file:
+                return json.load(file)
+        except Exception as e:
+            logging.error("Error reading task index file %s: %s", index_path, str(e))
+            return {}
+
+    def save_task_index(self, task_id: int):
+        """Save the (filepath -> [modification_time, size]) index of the source files found at the last scan of a task."""
+        if not self.taskIndex[task_id-1]:
+            return
+
+        index_path = self.task_index_path(task_id)
+        try:
+            with open(index_path, 'w') as file:
+                json.dump(self.taskIndex[task_id-1], file)
+            logging.info("Saved %d files index to %s", len(self.taskIndex[task_id-1]), index_path)
+        except Exception as e:
+            logging.error("Error writing task index file %s: %s", index_path, str(e))
+
     def adjust_window_size(self):
         """Dynamically resize the window based on the number of task rows."""
         # Calculate height: base height + (height per task row × number of tasks)
@@ -272,6 +337,7 @@ class SyncDBFrame(wx.Frame):
         self.taskGauges.append(gauge)
         self.taskStatus.append(st)
         self.taskFiles.append([])
+        self.taskIndex.append({})
                     
         return task_sizer
 
@@ -280,18 +346,13 @@ class SyncDBFrame(wx.Frame):
     def on_launch_all_tasks(self, event):
         """Main Thread: Triggered by user click on RunAll button."""
 
-        self.stop_requested = False
+        self.stop_event.clear()
 
         # Validate event_id (=button ID) and map to task
         for task_id in range(1, len(self.taskBtns) + 1):
 
-            # Create and start the worker thread
-            worker = threading.Thread(
-                target=self.run_task_logic,
-                args=(task_id,)
-            )
-            worker.daemon = True  # Thread closes if the app is closed
-            worker.start()
+            # Run the task in the tasks thread pool
+            self.submit_task(task_id)
 
             self.taskBtns[task_id-1].Disable()
             self.taskStatus[task_id-1].SetLabel(f"Status: Starting {self.taskLabels[task_id-1]}...")
@@ -308,15 +369,10 @@ class SyncDBFrame(wx.Frame):
         # Validate event_id (=button ID) and map to task
         if task_id in range(1, len(self.taskBtns) + 1):
 
-            self.stop_requested = False
+            self.stop_event.clear()
 
-            # Create and start the worker thread
-            worker = threading.Thread(
-                target=self.run_task_logic,
-                args=(task_id,)
-            )
-            worker.daemon = True  # Thread closes if the app is closed
-            worker.start()
+            # Run the task in the tasks thread pool
+            self.submit_task(task_id)
 
             btn.Disable()
             self.btnRunAll.Disable()
@@ -324,6 +380,16 @@ class SyncDBFrame(wx.Frame):
             self.taskStatus[task_id-1].SetLabel(f"Status: Starting Task{task_id}...")
             #self.status_text.SetLabel(f"Status: Starting Task{task_id}...")
 
+    def submit_task(self, task_id: int):
+        """Main Thread: Submit the run of a task to the tasks thread pool."""
+        def log_task_error(future: concurrent.futures.Future):
+            if not future.cancelled() and future.exception() is not None:
+                logging.error("Task %s :: Unexpected error: %s", self.taskLabels[task_id-1], str(future.exception()))
+
+        future = self.task_executor.submit(self.run_task_logic, task_id)
+        future.add_done_callback(log_task_error)
+        self.task_futures[task_id] = future
+
     def run_task_logic(self, task_id):
         """Worker Thread: Does the actual processing."""
 
@@ -332,12 +398,14 @@ class SyncDBFrame(wx.Frame):
         if self.run_scan:
             # Start scanning source for files to sync (randomize start time a bit)
             wx.CallAfter(self.taskStatus[task_id-1].SetLabel, f"{status_str} Scanning...")
-            time.sleep(random.uniform(0.5, 1.5))
+            self.stop_event.wait(random.uniform(0.5, 1.5))
+            # The scan start time is the next last synced time, such that the files changed during this run are selected again
+            scan_time = time.localtime()
             files_to_sync = self.scan_source_for_sync(task_id)
 
             if files_to_sync == 0:
                 wx.CallAfter(self.on_task_stopped, task_id)
-                if self.stop_requested:
+                if self.stop_event.is_set():
                     wx.CallAfter(self.taskStatus[task_id-1].SetLabel, f"{status_str} Scan cancelled.")
                 else:
                     wx.CallAfter(self.taskStatus[task_id-1].SetLabel, f"{status_str} No files to sync.")
@@ -353,19 +421,24 @@ class SyncDBFrame(wx.Frame):
                 else:
                     wx.CallAfter(self.taskStatus[task_id-1].SetLabel, f"{status_str} Copying and Evicting ({files_to_sync} files)...")
 
-                time.sleep(random.uniform(0.5, 1.5))
+                self.stop_event.wait(random.uniform(0.5, 1.5))
                 files_synced, files_evicted = self.sync_to_target_and_evict(task_id)
 
-                if files_synced == 0 or self.stop_requested:
+                # Store the source files index for the next (incremental) scan
+                if not self.stop_event.is_set():
+                    self.save_task_index(task_id)
+
+                if files_synced == 0 or self.stop_event.is_set():
                     wx.CallAfter(self.on_task_stopped,task_id)
-                    if self.stop_requested:
+                    if self.stop_event.is_set():
                         wx.CallAfter(self.taskStatus[task_id-1].SetLabel, f"{status_str} Sync cancelled.")
                     else:
                         wx.CallAfter(self.taskStatus[task_id-1].SetLabel, f"{status_str} No files were copied/synced. Likely, all files are already up-to-date in the cloud.")
                     return
 
-                # Store task run timestamp
-                self.taskConfigs[task_id-1]['synced'] = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime())
+                # Store task run (scan start) timestamp
+                self.taskConfigs[task_id-1]['synced'] = time.strftime("%Y-%m-%d %H:%M:%S", scan_time)
+                self.taskConfigs[task_id-1]['_synced_epoch'] = time.mktime(scan_time)
                 self.taskSizers[task_id-1].GetStaticBox().SetLabel(
                     self.taskConfigs[task_id-1]['name'] + \
                     f" (Last synced: {self.taskConfigs[task_id-1]['synced']})")
@@ -383,95 +456,149 @@ class SyncDBFrame(wx.Frame):
         Scans the source directory tree for files and folders to be synced. 
         Ignore items (file and folder names) based on the specified filters.
         The function is called from the worker thread run_task_logic().
-        The function populates self.taskFiles[task_id-1] with (filepath, modification_time) tuples
+        The function populates self.taskFiles[task_id-1] with (filepath, target_filepath, target_dirpath, modification_time, size) tuples
         and it returns the total number of files to sync.
 
+        When a files index from the last sync is available, a file is selected if it is new or its
+        modification time or size differs from the index, otherwise if it was modified since the last synced time.
+        With the 'fast_scan' task option, the files of the directories not modified since the last synced time
+        are skipped (their subdirectories are still scanned), unless the directory has files whose last copy failed.
+
         Args:
             task_id: The ID of the task to scan.
         Returns: 
             the total number of files to sync.
         """
-        # Reset list of files to proccesss (filepath, modification_time) tuples
+        # Reset list of files to proccesss (filepath, target_filepath, target_dirpath, modification_time, size) tuples
         self.taskFiles[task_id-1] = []  
+        self.taskIndex[task_id-1] = {}
         
         # Get source directory and last synced time
         source_dir = self.taskConfigs[task_id-1]['source']
-        time_tuple = time.strptime(self.taskConfigs[task_id-1]['synced'], "%Y-%m-%d %H:%M:%S")
-        last_run   = time.mktime(time_tuple)
+        target_dir = self.taskConfigs[task_id-1]['target']
+        # The parsed last synced time is cached in the (internal) '_synced_epoch' task config
+        last_run = self.taskConfigs[task_id-1].get('_synced_epoch')
+        if last_run is None:
+            synced_str = self.taskConfigs[task_id-1].get('synced') or ''
+            try:
+                last_run = time.mktime(time.strptime(synced_str, "%Y-%m-%d %H:%M:%S")) if synced_str else 0.0
+            except ValueError as e:
+                logging.warning("Task %s :: Invalid last synced time '%s', scanning all files: %s", self.taskLabels[task_id-1], synced_str, str(e))
+                last_run = 0.0
+            self.taskConfigs[task_id-1]['_synced_epoch'] = last_run
 
-        #  Get ignore filters from config
+        #  Get ignore filters and scan mode from config
         ignore_config = self.taskConfigs[task_id-1].get('ignore', [])
+        fast_scan = self.taskConfigs[task_id-1].get('fast_scan', False)
+
+        # Source files index from the last sync, and the one built by this scan
+        # The files whose copy failed at the last sync have a None index entry, and their directories are always scanned
+        # In fast_scan mode the files of the skipped directories keep their index entries
+        last_index = self.load_task_index(task_id)
+        failed_dirs = {os.path.dirname(path) for path, value in last_index.items() if value is None}
+        scan_index = {path: value for path, value in last_index.items() if value is not None} if fast_scan else {}
         
-        def should_ignore(filename: str) -> bool:
-            """Check if filename matches any ignore patterns."""
-            _fl = filename.lower()
-            for ignore_rule in ignore_config:
-                # Check 'startswith' patterns
-                for pattern in ignore_rule.get('startswith', []):
-                    if _fl.startswith(pattern.lower()):
-                        return True
-                # Check 'endswith' patterns
-                for pattern in ignore_rule.get('endswith', []):
-                    if _fl.endswith(pattern.lower()):
-                        return True
-            return False
-    
-        def walktree(topdir: str, callback: Callable) -> bool:
+        # Lowercased ignore patterns, as tuples for single startswith/endswith calls
+        ignore_starts = tuple(pattern.lower() for ignore_rule in ignore_config for pattern in ignore_rule.get('startswith', []))
+        ignore_ends   = tuple(pattern.lower() for ignore_rule in ignore_config for pattern in ignore_rule.get('endswith', []))
+
+        def should_ignore(name_lower: str) -> bool:
+            """Check if the (lowercased) file name matches any ignore patterns."""
+            return name_lower.startswith(ignore_starts) or name_lower.endswith(ignore_ends)
+
+        def scandir_for_sync(topdir: str, target_subdir: str, skip_files: bool = False) -> tuple[list[tuple[str, str, bool]], list[tuple], dict[str, list], int]:
             """
-            Recursively descend the directory tree rooted at top,
-            calling the callback function for each regular file.
+            Scan a single directory, without descending into its subdirectories.
+            The target_subdir is the corresponding directory in the target, used to resolve the target file paths.
+            With skip_files (fast_scan mode, unchanged directory) only the subdirectories are collected.
+            The function runs in the scan thread pool. On MacOS the directory is read with getattrlistbulk(), see _bulk_scan.py.
+            Returns:
+                the (directory, target directory, skip_files) tuples of the subdirectories to scan,
+                the (filepath, target_filepath, target_dirpath, modification_time, size) tuples of the files to sync,
+                the (filepath -> [modification_time, size]) index of all the files and the number of directory entries.
             """
+            child_dirs: list[tuple[str, str, bool]] = []
+            matched_files: list[tuple] = []
+            dir_index: dict[str, list] = {}
+            entries_count = 0
             try:
-                for f in os.listdir(topdir):
-
-                    # Check for stop request
-                    if self.stop_requested:
-                        return False
-
-                    # Send Pulse command to UI thread
-                    wx.CallAfter(self.taskGauges[task_id-1].Pulse)  
-
-                    # Process/check each file/directory
-                    pathname = os.path.join(topdir, f)
-                    mode = os.lstat(pathname).st_mode
-                    _fl = f.lower()
-                    if S_ISDIR(mode):
-                        # Apply filtering logic here if needed
-                        if should_ignore(f):
-                            continue
-                        # It's a directory, recurse into it
-                        if not walktree(pathname, callback):
-                            return False
-
-                    elif S_ISREG(mode):
-                        # Apply filtering logic here if needed
-                        if should_ignore(f):
-                            continue
-                        # It's a file, call the callback function
-                        callback(pathname)
-                   
-                    else:
-                        # Unknown file type, print a message
-                        logging.warning("Task %s :: Skipping %s: not a file or directory", self.taskLabels[task_id-1], pathname)
-            
-            except Exception as e:
-                logging.error(f"Task %s :: Error accessing %s: %s", self.taskLabels[task_id-1], topdir, str(e))
+                with _bulk_scan.scandir(topdir) as it:
+                    for entry in it:
+
+                        # Check for stop request
+                        if self.stop_event.is_set():
+                            break
+                        entries_count += 1
+
+                        # Process/check each file/directory
+                        name_lower = entry.name.lower()
+                        if entry.is_dir(follow_symlinks=False):
+                            # Apply filtering logic here if needed
+                            if should_ignore(name_lower):
+                                continue
+                            # Skip the files of the directories without any entries changed since last run
+                            # A directory modification time changes only with its direct entries, so its subdirectories are still scanned
+                            unchanged = False
+                            if fast_scan and entry.path not in failed_dirs:
+                                stats = entry.stat(follow_symlinks=False)
+                                unchanged = stats.st_mtime <= last_run and stats.st_ctime <= last_run
+                            # It's a directory, to be scanned next
+                            child_dirs.append((entry.path, os.path.join(target_subdir, entry.name), unchanged))
+
+                        elif entry.is_file(follow_symlinks=False):
+                            # Apply filtering logic here if needed
+                            if skip_files or should_ignore(name_lower):
+                                continue
+                            # It's a file, check if it needs to be synced
+                            stats = entry.stat(follow_symlinks=False)
+                            dir_index[entry.path] = [stats.st_mtime, stats.st_size]
+                            if last_index:
+                                modified = last_index.get(entry.path) != dir_index[entry.path]
+                            else:
+                                modified = stats.st_mtime > last_run or stats.st_ctime > last_run
+                            if modified:
+                                matched_files.append((entry.path, os.path.join(target_subdir, entry.name), target_subdir, stats.st_mtime, stats.st_size))
+                                logging.debug("Task %s :: File to sync: %s", self.taskLabels[task_id-1], entry.path)
 
-            return True
+                        else:
+                            # Unknown file type, print a message
+                            logging.warning("Task %s :: Skipping %s: not a file or directory", self.taskLabels[task_id-1], entry.path)
 
-        def file_to_sync(filepath: str):
-            """
-            Callback function to process each file.
-            """
-            stats = os.stat(filepath)
-            if stats.st_mtime > last_run or stats.st_ctime > last_run:
-                self.taskFiles[task_id-1].append((filepath, stats.st_mtime))
-                logging.debug("Task %s :: File to sync: %s", self.taskLabels[task_id-1], filepath)
+            except Exception as e:
+                logging.error(f"Task %s :: Error accessing %s: %s", self.taskLabels[task_id-1], topdir, str(e))
 
-        # Start walking recursively the source directory tree
-        if walktree(source_dir, file_to_sync):
+            return (child_dirs, matched_files, dir_index, entries_count)
+
+        # Walk the source directory tree, scanning the directories in parallel
+        # Each scanned directory submits its subdirectories to the scan thread pool
+        scan_workers = self.taskConfigs[task_id-1].get('scan_workers', 8)
+        last_ui = 0.0
+        with concurrent.futures.ThreadPoolExecutor(max_workers=scan_workers, thread_name_prefix=f"Scan{task_id}") as executor:
+            pending = {executor.submit(scandir_for_sync, source_dir, target_dir)}
+            while pending:
+
+                # Check for stop request
+                if self.stop_event.is_set():
+                    executor.shutdown(cancel_futures=True)
+                    break
+
+                done, pending = concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED)
+                for future in done:
+                    child_dirs, matched_files, dir_index, entries_count = future.result()
+                    pending.update(executor.submit(scandir_for_sync, *child_dir) for child_dir in child_dirs)
+                    self.taskFiles[task_id-1].extend(matched_files)
+                    scan_index.update(dir_index)
+
+                    # Send Pulse command to UI thread (throttled)
+                    now = time.monotonic()
+                    if entries_count and now - last_ui >= UI_UPDATE_INTERVAL:
+                        wx.CallAfter(self.taskGauges[task_id-1].Pulse)
+                        last_ui = now
+
+        if not self.stop_event.is_set():
+            self.taskIndex[task_id-1] = scan_index
             total_files = len(self.taskFiles[task_id-1])
-            logging.info("Task %s :: Found %d files to (potentially) sync in %s since last run at %s", self.taskLabels[task_id-1], total_files, source_dir, self.taskConfigs[task_id-1]['synced'])
+            logging.info("Task %s :: Found %d files to (potentially) sync in %s since last run at %s", self.taskLabels[task_id-1], total_files, source_dir, self.taskConfigs[task_id-1].get('synced') or 'never')
             return total_files
         else:
             self.taskFiles[task_id-1] = []
@@ -480,11 +607,12 @@ class SyncDBFrame(wx.Frame):
 
     def sync_to_target_and_evict(self, task_id: int, simsync: bool = False) -> tuple[int, int]:
         """
-        Sync files to target directory = copy file if it doesn't exist in target or if it is newer than the last copied version
+        Sync files to target directory = copy file if it doesn't exist in target or if its size or modification time differs from the last copied version
         Evict copied files from Cloud target if configured.
         The function is called from the worker thread run_task_logic().
 
-        The function processes self.taskFiles[task_id-1] which contains (filepath, modification_time) tuples.
+        The function processes self.taskFiles[task_id-1] which contains (filepath, target_filepath, target_dirpath, modification_time, size) tuples.
+        The target paths are resolved during the scan, in scan_source_for_sync().
 
         Args:
             task_id: The ID of the task to sync.
@@ -498,85 +626,193 @@ class SyncDBFrame(wx.Frame):
 
         task_str = f"Task {self.taskLabels[task_id-1]} ::"
 
-        # The configured  source and target directories for this task
-        source_dir = self.taskConfigs[task_id-1]['source']
-        target_dir = self.taskConfigs[task_id-1]['target']
+        # Target directories already created in this run
+        seen_dirs: set[str] = set()
+
+        def _copy_one(source_path: str, target_path: str, parent_dir: str, source_mtime: float, source_size: int) -> tuple[bool, str | None]:
+            """
+            Copy a single file to the target directory, if needed.
+            Runs in the copy thread pool.
+            Returns a (copied, target_path) tuple. The target_path is None when the copy failed,
+            and copied is False when the file was already up-to-date in the target.
+            """
+            try:
+                # Ensure the destination directory exists (only once per directory in this run)
+                if parent_dir not in seen_dirs:
+                    if not simsync:
+                        os.makedirs(parent_dir, exist_ok=True)
+                    else:
+                        logging.info("%s SIMULATED MKDIR for %s", task_str, parent_dir)
+                    seen_dirs.add(parent_dir)
+
+                # Copy the file if it doesn't exist in target or if its size or modification time differs from the last copied version
+                # Same size and modification time (within 1s, the timestamps resolution can differ) means already copied
+                try:
+                    tstat = os.stat(target_path)
+                    need_copy = not (tstat.st_size == source_size and abs(tstat.st_mtime - source_mtime) < 1.0)
+                except FileNotFoundError:
+                    need_copy = True
+
+                if need_copy:
+                    if not simsync:
+                        # copyfile uses the OS fast-copy path (fcopyfile/sendfile), copystat preserves metadata
+                        shutil.copyfile(source_path, target_path)
+                        shutil.copystat(source_path, target_path)
+                        logging.info("%s Copied %s to %s", task_str, source_path, target_path)
+                    else:
+                        logging.info("%s SIMULATED COPY for %s to %s", task_str, source_path, target_path)
+                    return (True, target_path)
+                return (False, target_path)
+
+            except Exception as e:
+                logging.error("%s Error processing %s: %s ", task_str, source_path, str(e))
+
+            return (False, None)
 
-        # Process each selected source file
+        # Process each selected source file (copy in parallel)
         copied_count  = 0
         evicted_count = 0
-        evict_retry   = []
-        for index, (source_path, source_mtime) in enumerate(self.taskFiles[task_id-1], start=1):
-                
-            # Check for stop request
-            if self.stop_requested:
+        copied_targets: list[str] = []
+        copy_workers = self.taskConfigs[task_id-1].get('copy_workers', 8)
+        last_ui = 0.0
+        with concurrent.futures.ThreadPoolExecutor(max_workers=copy_workers, thread_name_prefix=f"Copy{task_id}") as executor:
+            futures = {}
+            for file_to_sync in self.taskFiles[task_id-1]:
+                # Check for stop request
+                if self.stop_event.is_set():
+                    break
+                futures[executor.submit(_copy_one, *file_to_sync)] = file_to_sync[0]
+
+            for done, future in enumerate(concurrent.futures.as_completed(futures), start=1):
+
+                # Check for stop request
+                if self.stop_event.is_set():
+                    executor.shutdown(cancel_futures=True)
+                    logging.info("%s Sync cancelled by user: %d files copied, %d files evicted.", task_str, copied_count, evicted_count)
+                    return (copied_count, evicted_count)
+
+                # Update GUI from main thread (throttled, only the latest value is sent)
+                now = time.monotonic()
+                if now - last_ui >= UI_UPDATE_INTERVAL:
+                    wx.CallAfter(self.taskGauges[task_id-1].SetValue, done)
+                    last_ui = now
+
+                copied, target_path = future.result()
+                if copied:
+                    copied_count += 1
+                    copied_targets.append(target_path)
+                elif target_path is None:
+                    # Failed copy: mark the file in the index, such that it is selected again by the next scan
+                    self.taskIndex[task_id-1][futures[future]] = None
+
+        # Make sure the progress bar reaches the end
+        wx.CallAfter(self.taskGauges[task_id-1].SetValue, len(futures))
+
+        # Evict copied files from Cloud Target (frees up space in the local Cloud folder)
+        # Done after all copies, so the copy throughput is not throttled by the eviction delays
+        if self.run_evict and copied_targets:
+
+            # We wait a moment (once for all files) to ensure the Cloud provider "sees" the new files
+            cancelled = not simsync and self.stop_event.wait(EVICT_SETTLE_DELAY)
+
+            # Evict the files in parallel, and retry the evictions that failed the first time (with a longer backoff)
+            if not cancelled:
+                evicted, evict_retry, cancelled = self._evict_all(task_id, task_str, copied_targets, simsync)
+                evicted_count += evicted
+                if evict_retry and not cancelled:
+                    evicted, _, cancelled = self._evict_all(task_id, task_str, evict_retry, simsync, retry=True)
+                    evicted_count += evicted
+
+            if cancelled:
                 logging.info("%s Sync cancelled by user: %d files copied, %d files evicted.", task_str, copied_count, evicted_count)
                 return (copied_count, evicted_count)
-                    
-            # Update GUI from main thread
-            wx.CallAfter(self.taskGauges[task_id-1].SetValue, index)  
 
-            # Calculate the relative path to recreate structure in Target
-            rel_path = os.path.relpath(path=source_path, start=source_dir)
-            target_path = os.path.join(target_dir, rel_path)
+        logging.info("%s Sync completed: %d files copied, %d files evicted.", task_str, copied_count, evicted_count)
+        return (copied_count, evicted_count)
 
-            try:
-                # Ensure the destination directory exists
-                if not simsync:
-                    os.makedirs(os.path.dirname(target_path), exist_ok=True)
-                else:
-                    logging.info("%s SIMULATED MKDIR for %s", task_str, os.path.dirname(target_path))
 
-                # Copy the file if it doesn't exist in target or if it is newer than the last copied version
-                if not os.path.exists(target_path) or source_mtime > os.path.getmtime(target_path):
-                    if not simsync:
-                        shutil.copy2(source_path, target_path) # copy2 preserves metadata
-                        logging.info("%s Copied %s to %s", task_str, source_path, target_path)
-                    else:
-                        logging.info("%s SIMULATED COPY for %s to %s", task_str, source_path, target_path)
-                    copied_count += 1
+    def _evict_all(self, task_id: int, task_str: str, paths: list[str], simsync: bool = False, retry: bool = False) -> tuple[int, list[str], bool]:
+        """
+        Evict copied files from the Cloud target in parallel, with _evict() running in an eviction thread pool.
+        The function is called from sync_to_target_and_evict(), once for the copied files and once for the failed evictions.
 
-                    # Evict from Cloud Target (frees up space in the local Cloud folder)
-                    # We wait a moment to ensure the Cloud provider "sees" the new file
-                    if self.run_evict:
-                        if not simsync:
-                            time.sleep(5.0) 
-                            # Using the orginal 'fileproviderctl' does not work in latest MacOS versions (2024+)!
-                            # Use custom local code from https://github.com/istvanzk/cloudfile/tree/main
-                            subprocess.run(['./cloudfile', 'evict', target_path], capture_output=True, timeout=10, check=True)
-                            time.sleep(5.0) 
-                            logging.info("%s Evicted %s", task_str, target_path)
-                        else:
-                            logging.info("%s SIMULATED EVICT for %s", task_str, target_path)
+        Args:
+            task_id: The ID of the task.
+            task_str: The task prefix used in the log messages.
+            paths: The paths of the files to evict.
+            simsync: If True, no actual eviction is performed (for testing).
+            retry: If True, this is the 2nd attempt to evict the files.
+        Returns:
+            A tuple with the number of files evicted, the paths of the files which could not be evicted,
+            and whether the evictions were cancelled by the user.
+        """
+        attempt_str = "2nd attempt" if retry else "1st attempt"
+        evicted_count = 0
+        failed: list[str] = []
+
+        # One `cloudfile` call per file: evicting several paths per call (batching) is deferred
+        # until `cloudfile` documents multi-path (or stdin '-') input
+        with concurrent.futures.ThreadPoolExecutor(max_workers=EVICT_WORKERS, thread_name_prefix=f"Evict{task_id}") as executor:
+            futures = {executor.submit(self._evict, task_str, target_path, simsync, retry): target_path for target_path in paths}
+
+            for future in concurrent.futures.as_completed(futures):
+
+                # Check for stop request
+                if self.stop_event.is_set():
+                    executor.shutdown(cancel_futures=True)
+                    return (evicted_count, failed, True)
+
+                # Send Pulse command to UI thread
+                wx.CallAfter(self.taskGauges[task_id-1].Pulse)
+
+                target_path = futures[future]
+                try:
+                    if future.result():
                         evicted_count += 1
+                    else:
+                        failed.append(target_path)
+                except Exception as e:
+                    logging.error("%s Error processing eviction (%s) for %s: %s", task_str, attempt_str, target_path, str(e))
 
-            except (subprocess.TimeoutExpired, subprocess.CalledProcessError) as e:
-                logging.error("%s Evict error (1st attempt): %s", task_str, str(e))
-                evict_retry.append(target_path)
-            except Exception as e:
-                logging.error("%s Error processing %s: %s ", task_str, source_path, str(e))
+        return (evicted_count, failed, False)
+
+
+    def _evict(self, task_str: str, target_path: str, simsync: bool = False, retry: bool = False) -> bool:
+        """
+        Evict a copied file from the Cloud target, using the local `cloudfile` tool.
+        The evict command is tried up to 3 times, with an exponential backoff between the tries:
+        0.2s, 0.5s for the 1st attempt, and 0.5s, 1s for the 2nd (retry) attempt.
+        The function is called from the eviction thread pool in _evict_all().
 
-        # Retry evictions that failed the first time
-        for target_path in evict_retry:
-            # Send Pulse command to UI thread
-            wx.CallAfter(self.taskGauges[task_id-1].Pulse)
+        Args:
+            task_str: The task prefix used in the log messages.
+            target_path: The path of the file to evict.
+            simsync: If True, no actual eviction is performed (for testing).
+            retry: If True, this is the 2nd attempt to evict the file.
+        Returns:
+            True if the file was evicted, False if all the tries failed.
+        """
+        attempt_str = "2nd attempt" if retry else "1st attempt"
+        if simsync:
+            logging.info("%s SIMULATED EVICT (%s) for %s", task_str, attempt_str, target_path)
+            return True
 
-            # Retry eviction
+        # Waits between the tries
+        backoff = (0.5, 1.0) if retry else (0.2, 0.5)
+        for attempt in range(1, len(backoff) + 2):
             try:
-                if not simsync:
-                    subprocess.run(['./cloudfile', 'evict', target_path], capture_output=True, timeout=5, check=True)
-                    time.sleep(2.0) 
-                    logging.info("%s Evicted retry (2nd attempt) %s", task_str, target_path)
-                else:
-                    logging.info("%s SIMULATED EVICT retry (2nd attempt) for %s", task_str, target_path)
-                evicted_count += 1
+                # Using the orginal 'fileproviderctl' does not work in latest MacOS versions (2024+)!
+                # Use custom local code from https://github.com/istvanzk/cloudfile/tree/main
+                subprocess.run(['./cloudfile', 'evict', target_path], capture_output=True, timeout=5, check=True)
+                logging.info("%s Evicted (%s) %s", task_str, attempt_str, target_path)
+                return True
             except (subprocess.TimeoutExpired, subprocess.CalledProcessError) as e:
-                logging.error("%s Evict retry error (2nd attempt): %s", task_str, str(e))
-            except Exception as e:
-                logging.error("%s Error processing eviction retry (2nd attempt) for %s: %s", task_str, target_path, str(e))
+                logging.error("%s Evict error (%s, try %d): %s", task_str, attempt_str, attempt, str(e))
+                # No wait after the last try
+                if attempt > len(backoff) or self.stop_event.wait(backoff[attempt-1]):
+                    break
 
-        logging.info("%s Sync completed: %d files copied, %d files evicted.", task_str, copied_count, evicted_count)
-        return (copied_count, evicted_count)
+        return False
 
 
     def on_task_complete(self, task_id):
@@ -624,17 +860,29 @@ class SyncDBFrame(wx.Frame):
                 self.cbCopy.SetValue(True)
 
     def on_stop_button_click(self, event):
-        self.stop_requested = True
-        time.sleep(0.5)
+        self.stop_event.set()
+
+        # Tasks not yet started are cancelled directly
+        for task_id, future in self.task_futures.items():
+            if future.cancel():
+                self.on_task_stopped(task_id)
+                self.taskStatus[task_id-1].SetLabel(f"Status {self.taskLabels[task_id-1]}: Cancelled.")
 
     def on_quit_button_click(self, event):
-        self.stop_requested = True
-        time.sleep(0.5)
+        self.stop_event.set()
         self.Close()
 
     def on_close(self, event):
         """Handle the window close event."""
-        self.stop_requested = True
+        self.stop_event.set()
+
+        # The tasks stop at the next file, the pending copies/evictions are cancelled.
+        # The file copies already running are finished, such that no partially copied files are left in the Cloud target.
+        # The process exits when these are done (the pool threads are joined at exit).
+        self.task_executor.shutdown(wait=False, cancel_futures=True)
+        if any(not future.done() for future in self.task_futures.values()):
+            logging.info("Waiting for the running file copies to finish before exit.")
+
         self.save_tasks_to_config()
         logging.info("Sync application closed.")
         self.Destroy()